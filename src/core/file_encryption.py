@@ -8,11 +8,11 @@ password protection and encryption using cryptography library.
 import json
 import os
 from typing import Dict, Any
-from cryptography.fernet import Fernet, InvalidToken
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
 
+# Extension required for encrypted macro files
+MACRO_FILE_EXTENSION = '.gma.json'
+
 
 class PasswordValidationError(Exception):
     """Exception raised for password validation failures."""
@@ -35,6 +35,10 @@ class MacroFileManager:
 
     def _derive_key_from_password(self, password: str, salt: bytes) -> bytes:
         """Derive encryption key from password using PBKDF2."""
+        # Import here so cryptography is only loaded once a file is used
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
@@ -58,11 +62,12 @@ class MacroFileManager:
 
     def _reset_password_attempts(self, file_path: str) -> None:
         """Reset password attempts for a file after successful access."""
-        if file_path in self._password_attempts:
-            del self._password_attempts[file_path]
+        self._password_attempts.pop(file_path, None)
 
     def encrypt_file(self, password: str, data: Dict[str, Any]) -> bytes:
         """Encrypt macro data with password."""
+        from cryptography.fernet import Fernet
+
         self._validate_password(password)
 
         # Generate random salt
@@ -83,6 +88,8 @@ class MacroFileManager:
 
     def decrypt_file(self, password: str, encrypted_data: bytes) -> Dict[str, Any]:
         """Decrypt macro data with password."""
+        from cryptography.fernet import Fernet, InvalidToken
+
         self._validate_password(password)
 
         # Check minimum data length (16 bytes salt + some encrypted data)
@@ -120,8 +127,8 @@ class MacroFileManager:
         self, file_path: str, password: str, data: Dict[str, Any]
     ) -> None:
         """Save macro data to encrypted file."""
-        if not file_path.endswith('.gma.json'):
-            raise ValueError('File must have .gma.json extension')
+        if not file_path.endswith(MACRO_FILE_EXTENSION):
+            raise ValueError(f'File must have {MACRO_FILE_EXTENSION} extension')
 
         encrypted_data = self.encrypt_file(password, data)
 
@@ -30,7 +30,7 @@ class MouseButton(Enum):
     MIDDLE = 'middle'
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Represents a 2D position."""
 
@@ -47,7 +47,7 @@ class Position:
         return cls(x=data['x'], y=data['y'])
 
 
-@dataclass
+@dataclass(slots=True)
 class MouseOperation:
     """Represents a mouse operation."""
 
@@ -73,7 +73,7 @@ class MouseOperation:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class KeyboardOperation:
     """Represents a keyboard operation."""
 
@@ -93,7 +93,7 @@ class KeyboardOperation:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ScreenCondition:
     """Represents a screen matching condition."""
 
@@ -125,7 +125,7 @@ class ScreenCondition:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class OperationBlock:
     """Represents a single operation block in a macro."""
 
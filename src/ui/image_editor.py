@@ -5,40 +5,211 @@ This module provides an image editing window that allows users to select
 rectangular areas from screenshots for macro condition checking.
 """
 
+import functools
+import io
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, messagebox
+from typing import Optional, Tuple
+
 from PIL import Image, ImageTk
 
+# Decodes previews off the Tk thread; PIL releases the GIL while decoding
+_PREVIEW_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-preview')
+
+
+def _preview_size(
+    image_size: Tuple[int, int], max_width: int, max_height: int
+) -> Tuple[Tuple[int, int], float]:
+    """Get the preview size and scale factor for an image of image_size."""
+    img_w, img_h = image_size
+    scale_factor = min(max_width / img_w, max_height / img_h, 1.0)
+    if scale_factor == 1.0:
+        return image_size, scale_factor
+
+    display_size = (
+        max(1, int(img_w * scale_factor)),
+        max(1, int(img_h * scale_factor)),
+    )
+    return display_size, scale_factor
+
+
+def _make_preview(
+    image: Image.Image, max_width: int, max_height: int, resample: int
+) -> Tuple[Tuple[int, int], Image.Image, float]:
+    """Build a preview of image that fits max_width x max_height.
+
+    Returns:
+        The original size, the preview image and the preview scale factor
+    """
+    orig_size = image.size
+    display_size, scale_factor = _preview_size(orig_size, max_width, max_height)
+    return orig_size, _resize_preview(image, display_size, resample), scale_factor
+
+
+def _resize_preview(
+    image: Image.Image, display_size: Tuple[int, int], resample: int
+) -> Image.Image:
+    """Resize image to display_size, returning it as is when it already fits."""
+    if image.size != display_size:
+        # reducing_gap first shrinks by an integer factor with a cheap box
+        # reduce(), leaving only the remaining fraction to the resample filter
+        image = image.resize(display_size, resample, reducing_gap=2.0)
+    return _drop_opaque_alpha(image)
+
+
+def _drop_opaque_alpha(image: Image.Image) -> Image.Image:
+    """Convert an RGBA image to RGB when every pixel is fully opaque.
+
+    Screenshots rarely carry real transparency, and an RGB PhotoImage is a
+    quarter smaller to upload to Tk.
+    """
+    if image.mode == 'RGBA' and image.getextrema()[3][0] == 255:
+        return image.convert('RGB')
+    return image
+
+
+@functools.lru_cache(maxsize=8)
+def _decode_preview(
+    image_data: bytes, max_width: int, max_height: int, resample: int
+) -> Tuple[Tuple[int, int], Image.Image, float]:
+    """Decode image data into a preview, cached across editor reopens."""
+    image = Image.open(io.BytesIO(image_data))
+    orig_size = image.size
+    display_size, scale_factor = _preview_size(orig_size, max_width, max_height)
+
+    if scale_factor < 1.0:
+        # This image was opened here, so it may be changed in place: let a
+        # JPEG decode at a reduced DCT scale (a no-op for other formats)
+        image.draft(image.mode, display_size)
+
+    # Decode the pixels here on the worker; an image that already fits is
+    # returned without a resize and would otherwise be decoded lazily on the
+    # Tk thread by ImageTk.PhotoImage
+    image.load()
+    return orig_size, _resize_preview(image, display_size, resample), scale_factor
+
 
 class ImageEditor(tk.Toplevel):
     """Image editing window for selecting rectangular areas from screenshots."""
 
-    def __init__(self, parent: tk.Tk, image: Image.Image):
+    # Largest preview that fits the 800x600 window without scrolling
+    MAX_DISPLAY_WIDTH = 760
+    MAX_DISPLAY_HEIGHT = 500
+
+    # The preview only guides region selection, so a cheap filter is enough
+    PREVIEW_FILTER = Image.Resampling.BILINEAR
+
+    def __init__(
+        self, parent: tk.Tk, image: Image.Image, image_data: Optional[bytes] = None
+    ):
         """Initialize the image editor window.
 
         Args:
             parent: Parent tkinter window
             image: PIL Image to edit
+            image_data: Encoded bytes of image; when given, the preview is
+                decoded in the background and cached for later reopens
         """
         super().__init__(parent)
 
         self.title('画像編集')
         self.image = image
+        self.image_data = image_data
+        self._orig_size = image.size  # Full resolution of the original image
+        self.display_image = None  # Preview shown on the canvas
+        self.scale_factor = 1.0  # Preview size / original image size
+        self._display_size = image.size
+        self._preview_future = None  # Pending background preview decode
+        self._poll_after_id = None
+        self._image_item = None
         self.photo_image = None
         self.canvas = None
         self.selection_rect = None
+        self._selection_item = None  # Canvas rectangle reused across selections
         self.selection_coords = None
         self.start_x = 0
         self.start_y = 0
+        self._last_drag_xy = None  # Canvas position of the last handled drag
+        self._pending_drag_xy = None  # Drag position waiting for the next frame
+        self._drag_after_id = None
+        self._view_offset = (0, 0)  # Canvas coordinates of the view's top-left
 
+        self._load_image()
         self._setup_ui()
 
+    def _load_image(self):
+        """Prepare a preview no larger than the display area."""
+        # Large screenshots are only previewed; selections are mapped back to
+        # the original size through scale_factor
+        preview_args = (
+            self.MAX_DISPLAY_WIDTH,
+            self.MAX_DISPLAY_HEIGHT,
+            self.PREVIEW_FILTER,
+        )
+        if self.image_data is not None:
+            # The header alone gives the layout; pixels are decoded off-thread
+            self._display_size, self.scale_factor = _preview_size(
+                self._orig_size, self.MAX_DISPLAY_WIDTH, self.MAX_DISPLAY_HEIGHT
+            )
+            self._preview_future = _PREVIEW_POOL.submit(
+                _decode_preview, self.image_data, *preview_args
+            )
+        else:
+            preview = _make_preview(self.image, *preview_args)
+            self._orig_size, self.display_image, self.scale_factor = preview
+            self._display_size = self.display_image.size
+
+    def _poll_preview(self):
+        """Show the background-decoded preview once it is ready."""
+        self._poll_after_id = None
+        if not self._preview_future.done():
+            self._poll_after_id = self.after(16, self._poll_preview)
+            return
+
+        try:
+            preview = self._preview_future.result()
+        except (OSError, MemoryError) as e:
+            # Decode failures only; UnidentifiedImageError is an OSError
+            messagebox.showerror(
+                '画像エラー', f'画像の読み込みに失敗しました: {str(e)}'
+            )
+            self.destroy()
+            return
+
+        self._orig_size, self.display_image, self.scale_factor = preview
+        self._show_preview()
+
+    def _show_preview(self):
+        """Display the preview once the canvas is on screen."""
+        # Tk pixel data is only allocated for a canvas that is actually shown
+        if self.canvas.winfo_ismapped():
+            self._create_photo()
+        else:
+            self.canvas.bind('<Map>', self._on_canvas_map)
+
+    def _on_canvas_map(self, event):
+        """Build the preview PhotoImage when the canvas is first mapped."""
+        self.canvas.unbind('<Map>')
+        self._create_photo()
+
+    def _create_photo(self):
+        """Convert the preview to a PhotoImage and display it."""
+        self.photo_image = ImageTk.PhotoImage(self.display_image, master=self.canvas)
+        self.canvas.itemconfigure(self._image_item, image=self.photo_image)
+
     def _setup_ui(self):
         """Set up the user interface."""
         # Make window modal
         self.transient(self.master)
         self.grab_set()
 
+        # Close through destroy() so pending timers are cancelled as well
+        self.protocol('WM_DELETE_WINDOW', self.destroy)
+
+        # Read the preview size once; it is reused for scrolling and sizing
+        img_w, img_h = self._display_size
+
         # Set up main frame
         main_frame = ttk.Frame(self)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -47,12 +218,20 @@ class ImageEditor(tk.Toplevel):
         self.canvas = tk.Canvas(main_frame, bg='white')
         self.canvas.pack(fill=tk.BOTH, expand=True)
 
-        # Convert PIL image to PhotoImage for display
-        self.photo_image = ImageTk.PhotoImage(self.image, master=self.canvas)
-        self.canvas.create_image(0, 0, anchor=tk.NW, image=self.photo_image)
+        # Show the preview now, or once the background decode finishes
+        self._image_item = self.canvas.create_image(0, 0, anchor=tk.NW)
+        if self.display_image is not None:
+            self._show_preview()
+        else:
+            self._poll_after_id = self.after(16, self._poll_preview)
 
         # Configure canvas size
-        self.canvas.configure(scrollregion=(0, 0, self.image.width, self.image.height))
+        self.canvas.configure(scrollregion=(0, 0, img_w, img_h))
+
+        # The view only moves when the canvas is resized; track its offset so
+        # mouse handlers need no canvasx/canvasy round-trips
+        self._update_view_offset()
+        self.canvas.bind('<Configure>', self._update_view_offset)
 
         # Bind mouse events for rectangle selection
         self.canvas.bind('<Button-1>', self._on_mouse_press)
@@ -69,52 +248,129 @@ class ImageEditor(tk.Toplevel):
         )
         ttk.Button(button_frame, text='OK', command=self._on_ok).pack(side=tk.RIGHT)
 
-        # Resize window to fit image
-        window_width = min(800, self.image.width + 40)
-        window_height = min(600, self.image.height + 100)
-        self.geometry(f'{window_width}x{window_height}')
-
-        # Center window
-        self.update_idletasks()
+        # Size the window to fit the image and center it in one geometry call;
+        # the size is known up front, so no idle-task flush is needed
+        window_width = min(800, img_w + 40)
+        window_height = min(600, img_h + 100)
         x = (self.winfo_screenwidth() // 2) - (window_width // 2)
         y = (self.winfo_screenheight() // 2) - (window_height // 2)
         self.geometry(f'{window_width}x{window_height}+{x}+{y}')
 
+    def destroy(self):
+        """Cancel pending timers, then destroy the window."""
+        # after() callbacks are deleted with the window; a timer left behind
+        # would fire at a command that no longer exists
+        if self._poll_after_id is not None:
+            self.after_cancel(self._poll_after_id)
+            self._poll_after_id = None
+        self._cancel_pending_drag()
+        super().destroy()
+
     def _on_mouse_press(self, event):
         """Handle mouse press to start rectangle selection."""
-        self.start_x = event.x
-        self.start_y = event.y
+        self.start_x, self.start_y = self._to_canvas_xy(event)
+        self._last_drag_xy = None
+        self._cancel_pending_drag()
 
-        # Remove existing selection rectangle if any
+        # Hide the previous selection; its item is reused by the next drag
         if self.selection_rect:
-            self.canvas.delete(self.selection_rect)
+            self.canvas.itemconfigure(self.selection_rect, state=tk.HIDDEN)
             self.selection_rect = None
 
     def _on_mouse_drag(self, event):
         """Handle mouse drag to update rectangle selection."""
-        # Remove existing selection rectangle if any
+        # Skip motion events that land on the same canvas pixel
+        xy = self._to_canvas_xy(event)
+        if xy == self._last_drag_xy:
+            return
+        self._last_drag_xy = xy
+
+        if self._drag_after_id is None:
+            # Draw right away, then at most once per frame while dragging
+            self._draw_selection(xy)
+            self._drag_after_id = self.after(16, self._flush_drag)
+        else:
+            self._pending_drag_xy = xy
+
+    def _flush_drag(self):
+        """Draw the latest drag position deferred during the last frame."""
+        self._drag_after_id = None
+        if self._pending_drag_xy is not None:
+            self._draw_selection(self._pending_drag_xy)
+            self._pending_drag_xy = None
+            self._drag_after_id = self.after(16, self._flush_drag)
+
+    def _cancel_pending_drag(self):
+        """Drop any drag update still waiting for the next frame."""
+        if self._drag_after_id is not None:
+            self.after_cancel(self._drag_after_id)
+            self._drag_after_id = None
+        self._pending_drag_xy = None
+
+    def _draw_selection(self, xy):
+        """Draw the selection rectangle from the press point to xy."""
+        coords = (self.start_x, self.start_y, *xy)
+
         if self.selection_rect:
-            self.canvas.delete(self.selection_rect)
-
-        # Create new selection rectangle
-        self.selection_rect = self.canvas.create_rectangle(
-            self.start_x,
-            self.start_y,
-            event.x,
-            event.y,
-            outline='red',
-            width=2,
-            fill='',
-            tags='selection',
-        )
+            # Resize the visible rectangle in place
+            self.canvas.coords(self.selection_rect, *coords)
+        elif self._selection_item:
+            # Show the rectangle hidden by the last press at the new position
+            self.canvas.coords(self._selection_item, *coords)
+            self.canvas.itemconfigure(self._selection_item, state=tk.NORMAL)
+            self.selection_rect = self._selection_item
+        else:
+            # Create the selection rectangle on the first drag
+            self._selection_item = self.selection_rect = self.canvas.create_rectangle(
+                *coords,
+                outline='red',
+                width=2,
+                fill='',
+                tags='selection',
+            )
 
     def _on_mouse_release(self, event):
         """Handle mouse release to finalize rectangle selection."""
+        # Show the final drag position before the selection is stored
+        pending_xy = self._pending_drag_xy
+        self._cancel_pending_drag()
+        if pending_xy is not None:
+            self._draw_selection(pending_xy)
+
         if self.start_x is not None and self.start_y is not None:
             # Store selection coordinates
-            x1, y1 = min(self.start_x, event.x), min(self.start_y, event.y)
-            x2, y2 = max(self.start_x, event.x), max(self.start_y, event.y)
-            self.selection_coords = (x1, y1, x2, y2)
+            x, y = self._to_canvas_xy(event)
+            x1, y1 = min(self.start_x, x), min(self.start_y, y)
+            x2, y2 = max(self.start_x, x), max(self.start_y, y)
+            self.selection_coords = self._to_image_coords(x1, y1, x2, y2)
+
+    def _update_view_offset(self, event=None):
+        """Cache the canvas coordinates of the view's top-left corner."""
+        self._view_offset = (int(self.canvas.canvasx(0)), int(self.canvas.canvasy(0)))
+
+    def _to_canvas_xy(self, event):
+        """Convert event window coordinates to scrolled canvas coordinates."""
+        x_offset, y_offset = self._view_offset
+        return int(event.x) + x_offset, int(event.y) + y_offset
+
+    def _to_image_coords(self, x1, y1, x2, y2):
+        """Map a preview selection to pixel coordinates in the original image."""
+        img_w, img_h = self._orig_size
+        if self.scale_factor == 1.0:
+            return (
+                min(img_w, max(0, x1)),
+                min(img_h, max(0, y1)),
+                min(img_w, max(0, x2)),
+                min(img_h, max(0, y2)),
+            )
+
+        inv_scale = 1.0 / self.scale_factor  # One division for all four values
+        return (
+            min(img_w, max(0, round(x1 * inv_scale))),
+            min(img_h, max(0, round(y1 * inv_scale))),
+            min(img_w, max(0, round(x2 * inv_scale))),
+            min(img_h, max(0, round(y2 * inv_scale))),
+        )
 
     def _on_ok(self):
         """Handle OK button click."""
@@ -5,15 +5,21 @@ This module provides a modal dialog for saving MacroRecording objects
 to encrypted .gma.json files with password protection.
 """
 
+import hmac
 import tkinter as tk
 from tkinter import ttk
 from typing import Callable
+from src.core.file_encryption import MACRO_FILE_EXTENSION
 from src.core.macro_data import MacroRecording
 
 
 class SaveDialog:
     """Modal dialog for saving macro files with password protection."""
 
+    # Fixed dialog size (the dialog is not resizable)
+    WIDTH = 400
+    HEIGHT = 300
+
     def __init__(
         self, parent: tk.Tk, macro_data: MacroRecording, save_callback: Callable
     ):
@@ -33,35 +39,30 @@ class SaveDialog:
         # Create modal dialog
         self.dialog = tk.Toplevel(parent)
         self.dialog.title('マクロファイルの保存')
-        self.dialog.geometry('400x300')
         self.dialog.resizable(False, False)
-        self.dialog.grab_set()  # Make it modal
-        self.dialog.focus_set()
 
-        # Center the dialog
+        # Size and center the dialog in a single geometry call
         self._center_dialog()
 
+        self.dialog.grab_set()  # Make it modal
+        self.dialog.focus_set()
+
         # Setup UI elements
         self._setup_ui()
 
     def _center_dialog(self):
         """Center the dialog on the parent window."""
-        self.dialog.update_idletasks()
-
         # Get parent window position and size
         parent_x = self.root.winfo_x()
         parent_y = self.root.winfo_y()
         parent_width = self.root.winfo_width()
         parent_height = self.root.winfo_height()
 
-        # Calculate dialog position
-        dialog_width = self.dialog.winfo_width()
-        dialog_height = self.dialog.winfo_height()
-
-        x = parent_x + (parent_width // 2) - (dialog_width // 2)
-        y = parent_y + (parent_height // 2) - (dialog_height // 2)
+        # The dialog size is fixed, so no layout pass is needed to measure it
+        x = parent_x + (parent_width // 2) - (self.WIDTH // 2)
+        y = parent_y + (parent_height // 2) - (self.HEIGHT // 2)
 
-        self.dialog.geometry(f'+{x}+{y}')
+        self.dialog.geometry(f'{self.WIDTH}x{self.HEIGHT}+{x}+{y}')
 
     def _setup_ui(self):
         """Setup the user interface elements."""
@@ -142,13 +143,16 @@ class SaveDialog:
             )
             return
 
-        if password != confirm_password:
+        # Constant-time comparison; encode so non-ASCII passwords are accepted
+        if len(password) != len(confirm_password) or not hmac.compare_digest(
+            password.encode(), confirm_password.encode()
+        ):
             self.message_label.config(text='パスワードが一致しません', foreground='red')
             return
 
         # Add .gma.json extension if not present
-        if not filename.endswith('.gma.json'):
-            filename = filename + '.gma.json'
+        if not filename.endswith(MACRO_FILE_EXTENSION):
+            filename += MACRO_FILE_EXTENSION
 
         try:
             # Call the save callback with MacroRecording.to_dict() data
@@ -6,8 +6,9 @@ drag-and-drop reordering and undo/redo functionality.
 """
 
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import ttk
-from typing import List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from copy import deepcopy
 from PIL import Image
 import io
@@ -30,20 +31,37 @@ class DragDropCanvas(tk.Canvas):
         """Initialize the drag-drop canvas."""
         super().__init__(parent, **kwargs)
 
-        # Drag and drop state
-        self.drag_data = {'item': None, 'x': 0, 'y': 0}
+        # Drag and drop state (updated on every motion event)
+        self.drag_item: Optional[dict] = None
+        self.drag_x = 0
+        self.drag_y = 0
         self.drop_indicator = None
+        self._indicator_index: Optional[int] = None  # Index the indicator marks
+        self._indicator_after_id: Optional[str] = None  # Pending indicator update
+        self._indicator_y = 0
+        self._pending_dx = 0  # Drag offset not yet applied to the block
+        self._pending_dy = 0
         self.blocks = []  # List of visual block items
+        self._blocks_by_item: Dict[int, dict] = {}  # Canvas item id -> block data
         self.block_height = 60
         self.block_width = 300
         self.block_spacing = 10
         self.margin = 20
 
+        # Named font shared by every block label instead of a per-item spec
+        self._block_font = tkfont.Font(self, family='Arial', size=9)
+
+        # Layout constants used by every drag event, computed once
+        self._block_pitch = self.block_height + self.block_spacing
+        self._drop_offset = self.margin - self.block_spacing // 2
+
+        # Callback notified with (from_index, to_index) after blocks change
+        self._reorder_callback: Optional[Callable[[int, int], None]] = None
+
         # Bind drag events
         self.bind('<Button-1>', self._on_click)
         self.bind('<B1-Motion>', self._on_drag)
         self.bind('<ButtonRelease-1>', self._on_drop)
-        self.bind('<Motion>', self._on_motion)
 
         # Bind double-click for image editing
         self.bind('<Double-Button-1>', self._on_double_click)
@@ -56,10 +74,24 @@ class DragDropCanvas(tk.Canvas):
         if index is None:
             index = len(self.blocks)
 
-        y_pos = self.margin + index * (self.block_height + self.block_spacing)
+        # Store block data
+        block_data = {'operation': operation, 'index': index}
+        self._draw_block(block_data, index)
+
+        if index == len(self.blocks):
+            self.blocks.append(block_data)
+        else:
+            self.blocks.insert(index, block_data)
+            self._update_indices()
 
-        # Create block rectangle
-        block_rect = self.create_rectangle(
+        self._update_scroll_region()
+
+    def _draw_block(self, block_data: dict, index: int):
+        """Create the rectangle and text items for a block at the given index."""
+        operation = block_data['operation']
+        y_pos = self.margin + index * self._block_pitch
+
+        block_data['rect'] = self.create_rectangle(
             self.margin,
             y_pos,
             self.margin + self.block_width,
@@ -67,36 +99,27 @@ class DragDropCanvas(tk.Canvas):
             fill='#f0f0f0',
             outline='#888888',
             width=2,
-            tags=('block', f'block_{operation.id}'),
+            tags='block',
         )
+        # Block text only changes when the operation is edited, so format it
+        # once and reuse it across redraws
+        label = block_data.get('label')
+        if label is None:
+            label = block_data['label'] = self._get_block_text(operation)
 
-        # Create block text
-        text_content = self._get_block_text(operation)
-        block_text = self.create_text(
+        block_data['text'] = self.create_text(
             self.margin + 10,
             y_pos + 10,
-            text=text_content,
+            text=label,
             anchor='nw',
-            font=('Arial', 9),
+            font=self._block_font,
             width=self.block_width - 20,
-            tags=('block', f'block_{operation.id}'),
+            tags='block',
         )
 
-        # Store block data
-        block_data = {
-            'operation': operation,
-            'rect': block_rect,
-            'text': block_text,
-            'index': index,
-        }
-
-        if index == len(self.blocks):
-            self.blocks.append(block_data)
-        else:
-            self.blocks.insert(index, block_data)
-            self._update_indices()
-
-        self._update_scroll_region()
+        # Operation ids can repeat, so clicks resolve blocks by canvas item
+        self._blocks_by_item[block_data['rect']] = block_data
+        self._blocks_by_item[block_data['text']] = block_data
 
     def _get_block_text(self, operation: OperationBlock) -> str:
         """Generate display text for an operation block."""
@@ -118,130 +141,137 @@ class DragDropCanvas(tk.Canvas):
 
         return f'操作: {operation.operation_type.value}'
 
-    def _update_indices(self):
-        """Update the index values for all blocks."""
-        for i, block in enumerate(self.blocks):
-            block['index'] = i
+    def _update_indices(self, start: int = 0, stop: Optional[int] = None):
+        """Update the index values for blocks in [start, stop)."""
+        for i in range(start, len(self.blocks) if stop is None else stop):
+            self.blocks[i]['index'] = i
 
     def _update_scroll_region(self):
         """Update the scrollable region based on content."""
         if self.blocks:
-            height = self.margin * 2 + len(self.blocks) * (
-                self.block_height + self.block_spacing
-            )
+            height = self.margin * 2 + len(self.blocks) * self._block_pitch
         else:
             height = 200
         self.configure(scrollregion=(0, 0, self.block_width + self.margin * 2, height))
 
     def _on_click(self, event):
         """Handle mouse click to start drag operation."""
-        item = self.find_closest(event.x, event.y)[0]
-        tags = self.gettags(item)
-
-        # Check if clicked on a block
-        if 'block' in tags:
-            block_tag = [tag for tag in tags if tag.startswith('block_')]
-            if block_tag:
-                operation_id = block_tag[0][6:]  # Remove "block_" prefix
-
-                # Find the block data
-                for block in self.blocks:
-                    if block['operation'].id == operation_id:
-                        self.drag_data['item'] = block
-                        self.drag_data['x'] = event.x
-                        self.drag_data['y'] = event.y
-
-                        # Highlight the dragged block
-                        self.itemconfig(block['rect'], fill='#e0e0ff')
-                        break
+        block = self._find_block_at(event.x, event.y)
+        if block:
+            self.drag_item = block
+            self.drag_x = event.x
+            self.drag_y = event.y
+
+            # Highlight the dragged block
+            self.itemconfig(block['rect'], fill='#e0e0ff')
+
+    def _find_block_at(self, x: int, y: int) -> Optional[dict]:
+        """Find the block data under the given canvas position."""
+        item = self.find_closest(x, y)[0]
+        return self._blocks_by_item.get(item)
 
     def _on_drag(self, event):
         """Handle drag motion."""
-        if self.drag_data['item']:
+        if self.drag_item:
             # Calculate movement delta
-            dx = event.x - self.drag_data['x']
-            dy = event.y - self.drag_data['y']
+            dx = event.x - self.drag_x
+            dy = event.y - self.drag_y
 
-            # Move the block visually
-            block = self.drag_data['item']
-            self.move(block['rect'], dx, dy)
-            self.move(block['text'], dx, dy)
+            # Accumulate the offset; the block is moved once per idle cycle
+            self._pending_dx += dx
+            self._pending_dy += dy
 
             # Update drag position
-            self.drag_data['x'] = event.x
-            self.drag_data['y'] = event.y
+            self.drag_x = event.x
+            self.drag_y = event.y
 
             # Show drop indicator
-            self._update_drop_indicator(event.y)
+            self._schedule_drop_indicator(event.y)
+
+    def _schedule_drop_indicator(self, y_pos: int):
+        """Coalesce drop indicator updates to one per idle cycle."""
+        self._indicator_y = y_pos
+        if self._indicator_after_id is None:
+            self._indicator_after_id = self.after_idle(self._flush_drop_indicator)
+
+    def _flush_drop_indicator(self):
+        """Move the dragged block and draw the indicator for the latest position."""
+        self._indicator_after_id = None
+
+        if self.drag_item and (self._pending_dx or self._pending_dy):
+            # Move the block's own items; operation ids may be shared
+            self.move(self.drag_item['rect'], self._pending_dx, self._pending_dy)
+            self.move(self.drag_item['text'], self._pending_dx, self._pending_dy)
+            self._pending_dx = 0
+            self._pending_dy = 0
 
-    def _on_motion(self, event):
-        """Handle mouse motion for visual feedback."""
-        if self.drag_data['item']:
-            self._update_drop_indicator(event.y)
+        self._update_drop_indicator(self._indicator_y)
 
     def _update_drop_indicator(self, y_pos):
         """Update the visual drop indicator."""
-        if self.drop_indicator:
-            self.delete(self.drop_indicator)
-
         # Calculate target index based on y position
-        target_index = max(
-            0,
-            min(
-                len(self.blocks),
-                int(
-                    (y_pos - self.margin + self.block_spacing // 2)
-                    // (self.block_height + self.block_spacing)
-                ),
-            ),
-        )
+        target_index = self._get_drop_index(y_pos)
 
-        # Draw drop indicator line
-        indicator_y = (
-            self.margin + target_index * (self.block_height + self.block_spacing) - 5
-        )
-        self.drop_indicator = self.create_line(
-            self.margin,
-            indicator_y,
-            self.margin + self.block_width,
-            indicator_y,
-            fill='red',
-            width=3,
-            tags='drop_indicator',
-        )
+        # Most pointer moves stay within the same slot; nothing to redraw then
+        if self.drop_indicator and target_index == self._indicator_index:
+            return
+        self._indicator_index = target_index
+
+        # Move the existing indicator line, or draw it on first use
+        indicator_y = self.margin + target_index * self._block_pitch - 5
+        coords = (self.margin, indicator_y, self.margin + self.block_width, indicator_y)
+        if self.drop_indicator:
+            self.coords(self.drop_indicator, *coords)
+        else:
+            self.drop_indicator = self.create_line(
+                *coords, fill='red', width=3, tags='drop_indicator'
+            )
+
+    def _get_drop_index(self, y_pos: int) -> int:
+        """Get the insertion index for a drop at the given y position."""
+        index = int((y_pos - self._drop_offset) // self._block_pitch)
+        return max(0, min(len(self.blocks), index))
 
     def _on_drop(self, event):
         """Handle drop operation to reorder blocks."""
-        if self.drag_data['item']:
-            block = self.drag_data['item']
+        if self.drag_item:
+            block = self.drag_item
 
             # Calculate target index
-            target_index = max(
-                0,
-                min(
-                    len(self.blocks),
-                    int(
-                        (event.y - self.margin + self.block_spacing // 2)
-                        // (self.block_height + self.block_spacing)
-                    ),
-                ),
-            )
+            target_index = self._get_drop_index(event.y)
 
             # Perform the reorder
             current_index = block['index']
             if target_index != current_index and target_index != current_index + 1:
                 self._reorder_block(current_index, target_index)
             else:
-                # Just reset the position if no actual move
-                self._redraw_all_blocks()
+                # No actual move; put only the dragged block back
+                self._restore_block(block)
 
             # Reset drag state
-            self.drag_data = {'item': None, 'x': 0, 'y': 0}
+            self.drag_item = None
+            self.drag_x = 0
+            self.drag_y = 0
+            self._pending_dx = 0
+            self._pending_dy = 0
 
             # Clean up visual indicators
+            if self._indicator_after_id is not None:
+                self.after_cancel(self._indicator_after_id)
+                self._indicator_after_id = None
             if self.drop_indicator:
                 self.delete(self.drop_indicator)
                 self.drop_indicator = None
+            self._indicator_index = None
+
+    def _restore_block(self, block: dict):
+        """Return a dragged block to its slot and clear its drag highlight."""
+        x1, y1 = self.coords(block['rect'])[:2]
+        y_pos = self.margin + block['index'] * self._block_pitch
+        dx, dy = self.margin - x1, y_pos - y1
+        self.move(block['rect'], dx, dy)
+        self.move(block['text'], dx, dy)
+        self.itemconfig(block['rect'], fill='#f0f0f0')
 
     def _reorder_block(self, from_index: int, to_index: int):
         """Reorder blocks and redraw."""
@@ -256,45 +286,22 @@ class DragDropCanvas(tk.Canvas):
         # Redraw all blocks
         self._redraw_all_blocks()
 
-        # Update indices
-        self._update_indices()
+        # Update indices; only blocks between the two positions shifted
+        self._update_indices(min(from_index, to_index), max(from_index, to_index) + 1)
 
         # Notify parent of the change
-        if hasattr(self, '_reorder_callback') and self._reorder_callback:
+        if self._reorder_callback:
             self._reorder_callback(from_index, to_index)
 
     def _redraw_all_blocks(self):
         """Redraw all blocks in their correct positions."""
         # Clear all blocks
         self.delete('block')
+        self._blocks_by_item.clear()
 
         # Redraw blocks
         for i, block_data in enumerate(self.blocks):
-            y_pos = self.margin + i * (self.block_height + self.block_spacing)
-
-            # Recreate rectangle
-            block_data['rect'] = self.create_rectangle(
-                self.margin,
-                y_pos,
-                self.margin + self.block_width,
-                y_pos + self.block_height,
-                fill='#f0f0f0',
-                outline='#888888',
-                width=2,
-                tags=('block', f'block_{block_data["operation"].id}'),
-            )
-
-            # Recreate text
-            text_content = self._get_block_text(block_data['operation'])
-            block_data['text'] = self.create_text(
-                self.margin + 10,
-                y_pos + 10,
-                text=text_content,
-                anchor='nw',
-                font=('Arial', 9),
-                width=self.block_width - 20,
-                tags=('block', f'block_{block_data["operation"].id}'),
-            )
+            self._draw_block(block_data, i)
 
         self._update_scroll_region()
 
@@ -302,39 +309,45 @@ class DragDropCanvas(tk.Canvas):
         """Get the current ordered list of operations."""
         return [block['operation'] for block in self.blocks]
 
+    def set_blocks(self, operations: List[OperationBlock]):
+        """Replace all blocks, updating the scroll region once for the batch."""
+        self.delete('all')
+        self.drop_indicator = None
+        self.blocks.clear()
+        self._blocks_by_item.clear()
+
+        for index, operation in enumerate(operations):
+            block_data = {'operation': operation, 'index': index}
+            self._draw_block(block_data, index)
+            self.blocks.append(block_data)
+
+        self._update_scroll_region()
+
     def clear_blocks(self):
         """Clear all blocks from the canvas."""
         self.delete('all')
+        self.drop_indicator = None
         self.blocks.clear()
+        self._blocks_by_item.clear()
         self._update_scroll_region()
 
     def _on_double_click(self, event):
         """Handle double-click to open image editor for screen condition blocks."""
-        item = self.find_closest(event.x, event.y)[0]
-        tags = self.gettags(item)
-
-        # Check if clicked on a block
-        if 'block' in tags:
-            block_tag = [tag for tag in tags if tag.startswith('block_')]
-            if block_tag:
-                operation_id = block_tag[0][6:]  # Remove "block_" prefix
-
-                # Find the block data
-                for block in self.blocks:
-                    if block['operation'].id == operation_id:
-                        operation = block['operation']
-
-                        # Only open image editor for screen condition blocks with image data
-                        if (
-                            operation.operation_type == OperationType.SCREEN_CONDITION
-                            and operation.screen_condition
-                            and operation.screen_condition.image_data
-                        ):
-                            self._open_image_editor(operation)
-                        break
-
-    def _open_image_editor(self, operation: OperationBlock):
-        """Open the image editor for a screen condition operation."""
+        block = self._find_block_at(event.x, event.y)
+        if block:
+            operation = block['operation']
+
+            # Only open image editor for screen condition blocks with image data
+            if (
+                operation.operation_type == OperationType.SCREEN_CONDITION
+                and operation.screen_condition
+                and operation.screen_condition.image_data
+            ):
+                self._open_image_editor(block)
+
+    def _open_image_editor(self, block: dict):
+        """Open the image editor for a screen condition block."""
+        operation = block['operation']
         try:
             # Import here to avoid circular imports
             from .image_editor import ImageEditor
@@ -344,7 +357,7 @@ class DragDropCanvas(tk.Canvas):
             image = Image.open(io.BytesIO(image_data))
 
             # Create and show image editor
-            editor = ImageEditor(self.master, image)
+            editor = ImageEditor(self.master, image, image_data=image_data)
 
             # Wait for the editor to close and get the result
             self.master.wait_window(editor)
@@ -358,18 +371,17 @@ class DragDropCanvas(tk.Canvas):
                 # Update the screen condition region
                 operation.screen_condition.region = (x1, y1, width, height)
 
+                # Drop the cached label of the edited block
+                block.pop('label', None)
+                block_index = block['index']
+
                 # Update the display text to reflect the change
                 self._redraw_all_blocks()
 
                 # Notify parent of changes
-                if hasattr(self, '_reorder_callback') and self._reorder_callback:
+                if self._reorder_callback:
                     # Use the callback to notify of changes
                     # Since we're not reordering, we'll pass the same index twice
-                    block_index = next(
-                        i
-                        for i, b in enumerate(self.blocks)
-                        if b['operation'].id == operation.id
-                    )
                     self._reorder_callback(block_index, block_index)
 
         except Exception as e:
@@ -387,17 +399,32 @@ class UndoRedoManager:
     def __init__(self, max_history: int = 10):
         """Initialize with maximum history size."""
         self.max_history = max_history
-        self.history: List[List[OperationBlock]] = []
+        # Snapshots are immutable tuples; undo()/redo() hand out list copies
+        self.history: List[Tuple[OperationBlock, ...]] = []
         self.current_index = -1
 
     def save_state(self, operations: List[OperationBlock]):
         """Save current state to history."""
-        # Remove any redo history if we're not at the end
-        if self.current_index < len(self.history) - 1:
-            self.history = self.history[: self.current_index + 1]
+        # Drop any redo history in place (no-op when already at the end)
+        del self.history[self.current_index + 1 :]
 
-        # Add new state
-        self.history.append(deepcopy(operations))
+        # A change that restores the state before the last one (e.g. moving a
+        # block down and straight back) cancels out, so drop the dead entry
+        if self.current_index > 0 and tuple(operations) == self.history[-2]:
+            self.history.pop()
+            self.current_index -= 1
+            return
+
+        # Add new state, sharing unchanged blocks with the previous snapshot so
+        # a reorder only stores the new ordering rather than copying every block
+        previous = {op.id: op for op in self.history[-1]} if self.history else {}
+        snapshot = []
+        for operation in operations:
+            stored = previous.get(operation.id)
+            if stored is None or stored != operation:
+                stored = deepcopy(operation)
+            snapshot.append(stored)
+        self.history.append(tuple(snapshot))
 
         # Limit history size
         if len(self.history) > self.max_history:
@@ -409,14 +436,14 @@ class UndoRedoManager:
         """Undo to previous state."""
         if self.current_index > 0:
             self.current_index -= 1
-            return deepcopy(self.history[self.current_index])
+            return deepcopy(list(self.history[self.current_index]))
         return None
 
     def redo(self) -> Optional[List[OperationBlock]]:
         """Redo to next state."""
         if self.current_index < len(self.history) - 1:
             self.current_index += 1
-            return deepcopy(self.history[self.current_index])
+            return deepcopy(list(self.history[self.current_index]))
         return None
 
     def can_undo(self) -> bool:
@@ -441,6 +468,9 @@ class VisualEditor:
         self.macro_recording: Optional[MacroRecording] = None
         self.undo_manager = UndoRedoManager()
 
+        # Last (can_undo, can_redo) pair applied to the buttons
+        self._undo_redo_state = (False, False)
+
         # Callbacks
         self.on_macro_changed: Optional[Callable[[MacroRecording], None]] = None
 
@@ -506,11 +536,11 @@ class VisualEditor:
 
     def _setup_keyboard_shortcuts(self):
         """Set up keyboard shortcuts."""
-        self.root.bind('<Control-z>', lambda e: self._undo())
-        self.root.bind('<Control-Z>', lambda e: self._undo())
-        self.root.bind('<Control-y>', lambda e: self._redo())
-        self.root.bind('<Control-Y>', lambda e: self._redo())
-        self.root.bind('<Control-Shift-Z>', lambda e: self._redo())
+        self.root.bind('<Control-z>', self._undo)
+        self.root.bind('<Control-Z>', self._undo)
+        self.root.bind('<Control-y>', self._redo)
+        self.root.bind('<Control-Y>', self._redo)
+        self.root.bind('<Control-Shift-Z>', self._redo)
 
         # Make sure the window can receive key events
         self.root.focus_set()
@@ -519,12 +549,8 @@ class VisualEditor:
         """Load a macro recording into the editor."""
         self.macro_recording = macro
 
-        # Clear existing blocks
-        self.canvas.clear_blocks()
-
-        # Add operation blocks
-        for operation in macro.operations:
-            self.canvas.add_block(operation)
+        # Replace existing blocks with the macro's operations
+        self.canvas.set_blocks(macro.operations)
 
         # Save initial state for undo
         self.undo_manager.save_state(macro.operations)
@@ -568,41 +594,28 @@ class VisualEditor:
                 text=f'ブロックを移動しました: {from_index + 1} → {to_index + 1}'
             )
 
-    def _undo(self):
+    def _undo(self, event=None):
         """Perform undo operation."""
-        previous_state = self.undo_manager.undo()
-        if previous_state and self.macro_recording:
-            # Update macro
-            self.macro_recording.operations = previous_state
-
-            # Reload canvas
-            self.canvas.clear_blocks()
-            for operation in previous_state:
-                self.canvas.add_block(operation)
-
-            # Update UI
-            self._update_undo_redo_buttons()
-            self.status_label.config(text='操作を元に戻しました')
-
-            # Notify callback
-            if self.on_macro_changed:
-                self.on_macro_changed(self.macro_recording)
+        self._apply_history_state(self.undo_manager.undo(), '操作を元に戻しました')
 
-    def _redo(self):
+    def _redo(self, event=None):
         """Perform redo operation."""
-        next_state = self.undo_manager.redo()
-        if next_state and self.macro_recording:
+        self._apply_history_state(self.undo_manager.redo(), '操作をやり直しました')
+
+    def _apply_history_state(
+        self, operations: Optional[List[OperationBlock]], status_text: str
+    ):
+        """Apply a state restored from undo/redo history."""
+        if operations and self.macro_recording:
             # Update macro
-            self.macro_recording.operations = next_state
+            self.macro_recording.operations = operations
 
             # Reload canvas
-            self.canvas.clear_blocks()
-            for operation in next_state:
-                self.canvas.add_block(operation)
+            self.canvas.set_blocks(operations)
 
             # Update UI
             self._update_undo_redo_buttons()
-            self.status_label.config(text='操作をやり直しました')
+            self.status_label.config(text=status_text)
 
             # Notify callback
             if self.on_macro_changed:
@@ -610,15 +623,16 @@ class VisualEditor:
 
     def _update_undo_redo_buttons(self):
         """Update undo/redo button states."""
-        if self.undo_manager.can_undo():
-            self.undo_button.config(state='normal')
-        else:
-            self.undo_button.config(state='disabled')
+        state = (self.undo_manager.can_undo(), self.undo_manager.can_redo())
 
-        if self.undo_manager.can_redo():
-            self.redo_button.config(state='normal')
-        else:
-            self.redo_button.config(state='disabled')
+        # Skip the Tk round-trips when availability hasn't changed
+        if state == self._undo_redo_state:
+            return
+        self._undo_redo_state = state
+
+        can_undo, can_redo = state
+        self.undo_button.config(state='normal' if can_undo else 'disabled')
+        self.redo_button.config(state='normal' if can_redo else 'disabled')
 
     def show(self):
         """Show the visual editor window."""
@@ -29,6 +29,19 @@ class TestImageEditor:
         # Should be properly initialized
         assert editor is not None
 
+    def test_photo_image_created_when_canvas_is_mapped(self, tk_root):
+        """Test that the PhotoImage is only built once the canvas is shown."""
+        from src.ui.image_editor import ImageEditor
+
+        editor = ImageEditor(tk_root, self.test_image)
+        assert editor.photo_image is None
+        assert editor.canvas.bind('<Map>')
+
+        # Simulate the canvas being mapped
+        editor._on_canvas_map(None)
+        assert editor.photo_image is not None
+        assert not editor.canvas.bind('<Map>')
+
     def test_rectangle_selection_functionality(self, tk_root):
         """Test that mouse drag creates a rectangle selection."""
         from src.ui.image_editor import ImageEditor
@@ -68,6 +81,219 @@ class TestImageEditor:
             50,
         ), f'Expected (10, 10, 50, 50), got: {editor.selection_coords}'
 
+    def test_large_image_is_previewed_at_display_size(self, tk_root):
+        """Test that large screenshots are downscaled for display only."""
+        from src.ui.image_editor import ImageEditor
+
+        large_image = Image.new('RGB', (1520, 1000), color='blue')
+        editor = ImageEditor(tk_root, large_image)
+        tk_root.update()
+
+        assert editor.scale_factor == 0.5
+        assert editor.display_image.size == (760, 500)
+        assert editor.image is large_image
+
+        class MockEvent:
+            def __init__(self, x, y):
+                self.x = x
+                self.y = y
+
+        # Selections are reported in original image coordinates
+        editor._on_mouse_press(MockEvent(10, 20))
+        editor._on_mouse_drag(MockEvent(60, 70))
+        editor._on_mouse_release(MockEvent(60, 70))
+        assert editor.selection_coords == (20, 40, 120, 140)
+
+    def test_large_jpeg_preview_leaves_caller_image_untouched(self, tk_root):
+        """Test that JPEG previews keep mapping to the original resolution."""
+        import io
+
+        from src.ui.image_editor import ImageEditor
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (3040, 2000), color='green').save(buffer, 'JPEG')
+        jpeg_image = Image.open(io.BytesIO(buffer.getvalue()))
+
+        editor = ImageEditor(tk_root, jpeg_image)
+        tk_root.update()
+
+        # The caller's image is not resized, and the coordinate mapping
+        # follows the original resolution
+        assert jpeg_image.size == (3040, 2000)
+        assert editor.scale_factor == 0.25
+        assert editor.display_image.size == (760, 500)
+        assert editor._to_image_coords(10, 20, 60, 70) == (40, 80, 240, 280)
+
+    def test_large_preview_reduces_before_resampling(self):
+        """Test that large previews use an integer reduce() before resampling."""
+        from src.ui.image_editor import _make_preview
+
+        image = Image.new('RGB', (3040, 2000), color='green')
+        with patch.object(
+            Image.Image, 'reduce', autospec=True, side_effect=Image.Image.reduce
+        ) as reduce:
+            orig_size, preview, scale_factor = _make_preview(
+                image, 760, 500, Image.Resampling.BILINEAR
+            )
+
+        reduce.assert_called_once()
+        assert orig_size == (3040, 2000)
+        assert preview.size == (760, 500)
+        assert scale_factor == 0.25
+
+    def test_decoded_jpeg_preview_uses_draft_decoding(self):
+        """Test that previews decoded from JPEG data use a reduced DCT scale."""
+        import io
+
+        from PIL import JpegImagePlugin
+
+        from src.ui.image_editor import _decode_preview
+
+        _decode_preview.cache_clear()  # A cached result would skip decoding
+        buffer = io.BytesIO()
+        Image.new('RGB', (3040, 2000), color='green').save(buffer, 'JPEG')
+
+        with patch.object(
+            JpegImagePlugin.JpegImageFile,
+            'draft',
+            autospec=True,
+            side_effect=JpegImagePlugin.JpegImageFile.draft,
+        ) as draft:
+            orig_size, preview, scale_factor = _decode_preview(
+                buffer.getvalue(), 760, 500, Image.Resampling.BILINEAR
+            )
+
+        draft.assert_called_once()
+        assert orig_size == (3040, 2000)
+        assert preview.size == (760, 500)
+        assert scale_factor == 0.25
+
+    def test_decoded_preview_is_loaded_when_it_fits(self):
+        """Test that a preview needing no resize is still decoded by the worker."""
+        import io
+
+        from src.ui.image_editor import _decode_preview
+
+        _decode_preview.cache_clear()
+        buffer = io.BytesIO()
+        Image.new('RGB', (120, 80), color='green').save(buffer, 'PNG')
+
+        _, preview, scale_factor = _decode_preview(
+            buffer.getvalue(), 760, 500, Image.Resampling.BILINEAR
+        )
+
+        assert scale_factor == 1.0
+        assert preview.im is not None
+
+    def test_opaque_alpha_dropped_from_preview(self):
+        """Test that previews of fully opaque RGBA images are converted to RGB."""
+        from src.ui.image_editor import _make_preview
+
+        opaque = Image.new('RGBA', (100, 100), color=(255, 0, 0, 255))
+        _, preview, _ = _make_preview(opaque, 760, 500, Image.Resampling.BILINEAR)
+        assert preview.mode == 'RGB'
+
+        translucent = Image.new('RGBA', (100, 100), color=(255, 0, 0, 128))
+        _, preview, _ = _make_preview(translucent, 760, 500, Image.Resampling.BILINEAR)
+        assert preview.mode == 'RGBA'
+
+    def test_preview_reused_for_same_image_data(self, tk_root):
+        """Test that reopening the same image data reuses the decoded preview."""
+        import io
+
+        from src.ui.image_editor import ImageEditor
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (1520, 1000), color='blue').save(buffer, 'PNG')
+        image_data = buffer.getvalue()
+
+        first = ImageEditor(
+            tk_root, Image.open(io.BytesIO(image_data)), image_data=image_data
+        )
+        # The window is laid out from the header before pixels are decoded
+        assert first.scale_factor == 0.5
+        self._wait_for_preview(tk_root, first)
+        assert first.display_image.size == (760, 500)
+        first.destroy()
+
+        second = ImageEditor(
+            tk_root, Image.open(io.BytesIO(image_data)), image_data=image_data
+        )
+        self._wait_for_preview(tk_root, second)
+
+        assert second.display_image is first.display_image
+        assert second.scale_factor == 0.5
+        assert second._orig_size == (1520, 1000)
+
+    def test_destroy_cancels_pending_timers(self, tk_root):
+        """Test that closing the editor early leaves no timers behind."""
+        import io
+
+        from src.ui.image_editor import ImageEditor
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (200, 100), color='blue').save(buffer, 'PNG')
+        image_data = buffer.getvalue()
+
+        editor = ImageEditor(
+            tk_root, Image.open(io.BytesIO(image_data)), image_data=image_data
+        )
+
+        class MockEvent:
+            def __init__(self, x, y):
+                self.x = x
+                self.y = y
+
+        editor._on_mouse_press(MockEvent(10, 10))
+        editor._on_mouse_drag(MockEvent(20, 20))
+        timers = [editor._poll_after_id, editor._drag_after_id]
+        assert None not in timers
+
+        editor.destroy()
+        pending = tk_root.tk.splitlist(tk_root.tk.call('after', 'info'))
+        assert not set(timers) & set(pending)
+
+    def _wait_for_preview(self, tk_root, editor):
+        """Run the event loop until the background preview is shown."""
+        import time
+
+        editor._preview_future.result()
+        deadline = time.monotonic() + 5
+        while editor.display_image is None and time.monotonic() < deadline:
+            tk_root.update()
+            time.sleep(0.005)
+
+    def test_drag_updates_are_drawn_once_per_frame(self, tk_root):
+        """Test that a burst of drag events redraws the selection once."""
+        from src.ui.image_editor import ImageEditor
+
+        editor = ImageEditor(tk_root, self.test_image)
+        tk_root.update()
+
+        class MockEvent:
+            def __init__(self, x, y):
+                self.x = x
+                self.y = y
+
+        editor._on_mouse_press(MockEvent(10, 10))
+        editor._on_mouse_drag(MockEvent(20, 20))
+        rect = editor.selection_rect
+
+        with patch.object(editor, '_draw_selection') as draw:
+            for x in (30, 40, 50):
+                editor._on_mouse_drag(MockEvent(x, x))
+            draw.assert_not_called()
+
+            editor._flush_drag()
+            draw.assert_called_once_with((50, 50))
+
+        # Release draws a still-pending position before storing the selection
+        editor._on_mouse_drag(MockEvent(70, 60))
+        editor._on_mouse_release(MockEvent(70, 60))
+        assert editor.canvas.coords(rect) == [10, 10, 70, 60]
+        assert editor.selection_coords == (10, 10, 70, 60)
+        assert editor._drag_after_id is None
+
     def test_selection_area_highlight_display(self, tk_root):
         """Test that selection area is properly highlighted."""
         from src.ui.image_editor import ImageEditor
@@ -99,6 +325,56 @@ class TestImageEditor:
         rect_coords = editor.canvas.coords(editor.selection_rect)
         assert rect_coords == [10, 10, 50, 50]
 
+    def test_selection_rectangle_reused_across_drags(self, tk_root):
+        """Test that dragging moves one rectangle instead of recreating it."""
+        from src.ui.image_editor import ImageEditor
+
+        editor = ImageEditor(tk_root, self.test_image)
+        tk_root.update()
+
+        class MockEvent:
+            def __init__(self, x, y):
+                self.x = x
+                self.y = y
+
+        editor._on_mouse_press(MockEvent(10, 10))
+        editor._on_mouse_drag(MockEvent(30, 30))
+        rect = editor.selection_rect
+        editor._on_mouse_drag(MockEvent(60, 40))
+        editor._on_mouse_release(MockEvent(60, 40))
+        assert editor.selection_rect == rect
+        assert editor.canvas.coords(rect) == [10, 10, 60, 40]
+
+        # A new press hides the rectangle and the next drag shows it again
+        editor._on_mouse_press(MockEvent(20, 20))
+        assert editor.selection_rect is None
+        assert editor.canvas.itemcget(rect, 'state') == 'hidden'
+
+        editor._on_mouse_drag(MockEvent(40, 45))
+        assert editor.selection_rect == rect
+        assert editor.canvas.itemcget(rect, 'state') == 'normal'
+        assert editor.canvas.coords(rect) == [20, 20, 40, 45]
+        assert len(editor.canvas.find_withtag('selection')) == 1
+
+        # Repeated motion at the same position does not touch the canvas
+        with (
+            patch.object(editor.canvas, 'coords') as coords,
+            patch.object(editor.canvas, 'canvasx') as canvasx,
+        ):
+            editor._on_mouse_drag(MockEvent(40, 45))
+            coords.assert_not_called()
+            canvasx.assert_not_called()
+
+    def test_unscaled_selection_is_clamped_to_image(self, tk_root):
+        """Test that a drag past the image edge is clamped at full scale."""
+        from src.ui.image_editor import ImageEditor
+
+        editor = ImageEditor(tk_root, self.test_image)
+        tk_root.update()
+        assert editor.scale_factor == 1.0
+
+        assert editor._to_image_coords(-5, 10, 150, 120) == (0, 10, 100, 100)
+
     def test_minimum_selection_size_error(self, tk_root):
         """Test that selections smaller than 5x5 pixels show error message."""
         from src.ui.image_editor import ImageEditor
@@ -5,7 +5,7 @@ Unit tests for visual editor drag-and-drop functionality.
 import pytest
 import tkinter as tk
 import time
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 import sys
 import os
 
@@ -82,6 +82,42 @@ class TestUndoRedoManager:
         # Should not exceed max history
         assert len(self.manager.history) <= self.manager.max_history
 
+    def test_snapshots_share_unchanged_blocks(self):
+        """Test that consecutive snapshots only copy blocks that changed."""
+        self.manager.save_state(self.sample_ops)
+        self.manager.save_state(self.sample_ops[::-1])
+
+        first, second = self.manager.history
+        assert second[0] is first[1]
+        assert second[1] is first[0]
+
+        # A modified block must get its own copy
+        self.sample_ops[0].delay_after = 1.5
+        self.manager.save_state(self.sample_ops)
+        third = self.manager.history[-1]
+        assert third[0] is not second[1]
+        assert third[0].delay_after == 1.5
+        assert third[1] is second[0]
+
+        # Snapshots are immutable; undo() hands out an independent list
+        assert isinstance(third, tuple)
+        restored = self.manager.undo()
+        assert isinstance(restored, list)
+        restored[0].delay_after = 9.0
+        assert self.manager.history[1][0].delay_after == 0.0
+
+    def test_cancelling_change_is_coalesced(self):
+        """Test that a change undone by the next one leaves no history entry."""
+        self.manager.save_state(self.sample_ops)
+        self.manager.save_state(self.sample_ops[::-1])
+
+        # Moving the block back restores the original order
+        self.manager.save_state(self.sample_ops)
+
+        assert len(self.manager.history) == 1
+        assert not self.manager.can_undo()
+        assert not self.manager.can_redo()
+
     def test_save_after_undo_clears_redo(self):
         """Test that saving new state after undo clears redo history."""
         # Save states and undo
@@ -171,6 +207,15 @@ class TestDragDropCanvas:
             assert block['index'] == i
             assert block['operation'] == self.sample_ops[i]
 
+    def test_find_block_with_duplicate_operation_id(self):
+        """Test that blocks sharing an operation id are told apart."""
+        self.sample_ops[2].id = self.sample_ops[0].id
+        for op in self.sample_ops:
+            self.canvas.add_block(op)
+
+        assert self.canvas._find_block_at(40, 30) is self.canvas.blocks[0]
+        assert self.canvas._find_block_at(40, 180) is self.canvas.blocks[2]
+
     def test_get_ordered_operations(self):
         """Test getting ordered operations."""
         # Add blocks
@@ -181,6 +226,21 @@ class TestDragDropCanvas:
         assert len(ordered_ops) == len(self.sample_ops)
         assert ordered_ops == self.sample_ops
 
+    def test_set_blocks_replaces_blocks(self):
+        """Test replacing all blocks in one batch."""
+        self.canvas.add_block(self.sample_ops[0])
+
+        with patch.object(
+            self.canvas,
+            '_update_scroll_region',
+            wraps=self.canvas._update_scroll_region,
+        ) as update_scroll:
+            self.canvas.set_blocks(self.sample_ops[::-1])
+            update_scroll.assert_called_once()
+
+        assert self.canvas.get_ordered_operations() == self.sample_ops[::-1]
+        assert [block['index'] for block in self.canvas.blocks] == [0, 1, 2]
+
     def test_clear_blocks(self):
         """Test clearing all blocks."""
         # Add blocks then clear
@@ -210,10 +270,116 @@ class TestDragDropCanvas:
         assert ordered_ops[0] == self.sample_ops[1]  # Second becomes first
         assert ordered_ops[1] == self.sample_ops[2]  # Third becomes second
         assert ordered_ops[2] == self.sample_ops[0]  # First becomes last
+        assert [block['index'] for block in self.canvas.blocks] == [0, 1, 2]
 
         # Check callback was called
         self.canvas._reorder_callback.assert_called_once()
 
+    def test_drop_in_place_restores_only_dragged_block(self):
+        """Test that a drop without a move does not redraw every block."""
+        self.sample_ops[2].id = self.sample_ops[1].id
+        for op in self.sample_ops:
+            self.canvas.add_block(op)
+
+        block = self.canvas.blocks[1]
+        original = self.canvas.coords(block['rect'])
+        other = self.canvas.coords(self.canvas.blocks[2]['rect'])
+        self.canvas._on_click(Mock(x=40, y=100))
+        self.canvas._on_drag(Mock(x=55, y=110))
+        self.root.update_idletasks()
+
+        with patch.object(self.canvas, '_redraw_all_blocks') as redraw:
+            self.canvas._on_drop(Mock(x=55, y=110))
+            redraw.assert_not_called()
+
+        assert self.canvas.coords(block['rect']) == original
+        assert self.canvas.coords(block['text'])[:2] == [
+            self.canvas.margin + 10,
+            original[1] + 10,
+        ]
+        assert self.canvas.coords(self.canvas.blocks[2]['rect']) == other
+        assert self.canvas.itemcget(block['rect'], 'fill') == '#f0f0f0'
+        assert self.canvas.get_ordered_operations() == self.sample_ops
+
+    def test_plain_motion_is_not_bound(self):
+        """Test that pointer motion without a button held is never handled."""
+        for op in self.sample_ops:
+            self.canvas.add_block(op)
+        assert not self.canvas.bind('<Motion>')
+
+        self.canvas._on_click(Mock(x=40, y=30))
+        assert not self.canvas.bind('<Motion>')
+
+    def test_drop_index_is_clamped_to_block_range(self):
+        """Test drop index calculation from y positions."""
+        for op in self.sample_ops:
+            self.canvas.add_block(op)
+
+        assert self.canvas._get_drop_index(-100) == 0
+        assert self.canvas._get_drop_index(self.canvas.margin) == 0
+        assert self.canvas._get_drop_index(self.canvas.margin + 70) == 1
+        assert self.canvas._get_drop_index(10_000) == len(self.sample_ops)
+
+    def test_drop_indicator_updates_are_coalesced(self):
+        """Test that a burst of drag events redraws the indicator once."""
+        self.sample_ops[2].id = self.sample_ops[0].id
+        for op in self.sample_ops:
+            self.canvas.add_block(op)
+        block = self.canvas.blocks[0]
+        other = self.canvas.blocks[2]
+        self.canvas._on_click(Mock(x=40, y=30))
+        assert self.canvas.drag_item is block
+        start = self.canvas.coords(block['rect'])
+        other_start = self.canvas.coords(other['rect'])
+
+        with patch.object(self.canvas, '_update_drop_indicator') as update:
+            for y in (60, 90, 160):
+                self.canvas._on_drag(Mock(x=40, y=y))
+            update.assert_not_called()
+            assert self.canvas.coords(block['rect']) == start
+
+            self.root.update_idletasks()
+            update.assert_called_once_with(160)
+
+        # The accumulated offset is applied to the whole block at once
+        assert self.canvas.coords(block['rect'])[1] == start[1] + 130
+        assert self.canvas.coords(block['text'])[1] == self.canvas.margin + 10 + 130
+
+        # A block sharing the operation id stays where it was
+        assert self.canvas.coords(other['rect']) == other_start
+
+    def test_drop_indicator_kept_within_same_slot(self):
+        """Test that the indicator is only redrawn when the slot changes."""
+        for op in self.sample_ops:
+            self.canvas.add_block(op)
+
+        self.canvas._update_drop_indicator(self.canvas.margin + 70)
+        indicator = self.canvas.drop_indicator
+        self.canvas._update_drop_indicator(self.canvas.margin + 75)
+        assert self.canvas.drop_indicator == indicator
+
+        self.canvas._update_drop_indicator(self.canvas.margin + 140)
+        assert self.canvas._indicator_index == 2
+
+        # Changing slots moves the same line rather than recreating it
+        assert self.canvas.drop_indicator == indicator
+        indicator_y = self.canvas.margin + 2 * self.canvas._block_pitch - 5
+        assert self.canvas.coords(indicator)[1] == indicator_y
+
+    def test_block_label_cached_across_redraws(self):
+        """Test that block text is formatted once and reused on redraw."""
+        for op in self.sample_ops:
+            self.canvas.add_block(op)
+
+        block = self.canvas.blocks[0]
+        assert block['label'] == self.canvas._get_block_text(self.sample_ops[0])
+
+        with patch.object(self.canvas, '_get_block_text') as get_text:
+            self.canvas._reorder_block(0, 3)
+            get_text.assert_not_called()
+
+        assert self.canvas.itemcget(block['text'], 'text') == block['label']
+
     def test_block_text_generation(self):
         """Test block text generation for different operation types."""
         # Mouse click